@@ -3,12 +3,18 @@ Atlan Webhook Stories App - NEW VERSION
 Interactive demonstration of webhook data with playground features
 """
 
+import os
 import streamlit as st
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 import pandas as pd
+import time
 
 # Page configuration
 st.set_page_config(
@@ -21,6 +27,10 @@ st.set_page_config(
 API_BASE_URL = "https://access-request-api.onrender.com"
 LOCAL_API_URL = "http://localhost:8080"
 
+# APIs to try, in order. Deployments set API_URL so only their API is
+# queried, instead of also probing a localhost with nothing behind it
+API_URLS = [os.environ["API_URL"]] if os.getenv("API_URL") else [API_BASE_URL, LOCAL_API_URL]
+
 # Mock webhook payload - fallback when no real data exists
 MOCK_WEBHOOK_DATA = {
     "id": "DA-DEMO-SAMPLE",
@@ -44,35 +54,169 @@ MOCK_WEBHOOK_DATA = {
     "timestamp": "2024-12-30T14:42:00Z"
 }
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Shared HTTP session so API calls reuse keep-alive connections.
+    
+    Cached as a resource because Streamlit re-executes this script on every
+    rerun - a plain module-level Session would be rebuilt (and its pooled
+    TLS connections dropped) each time. One quick retry covers a dropped
+    keep-alive connection or a gateway error while the API wakes up.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(total=1, backoff_factor=0.1, status_forcelist=(502, 503, 504), allowed_methods=["GET"])
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+# (connect, read) timeouts - a dead host fails fast on connect without
+# cutting off a slow response body
+API_TIMEOUT = (1.0, 4.0)
+
+# Choices for how many of the latest webhooks the table and selector show
+SHOW_LATEST_OPTIONS = [25, 50, 100, 500, "All"]
+
+# Tables up to this many rows are rendered with st.table instead of st.dataframe
+STATIC_TABLE_MAX_ROWS = 50
+
+@st.cache_resource
+def get_api_preference() -> Dict[str, Optional[str]]:
+    """Remembers which API URL answered last, shared across reruns and sessions"""
+    return {"last_good": None}
+
+@st.cache_resource
+def get_etag_cache() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Last ETag and fetch result per webhook list URL, shared across reruns and sessions"""
+    return {}
+
+def conditional_get(session: requests.Session, url: str, etags: Dict[str, Tuple[str, Dict[str, Any]]]) -> requests.Response:
+    """GET url, sending the ETag of the last result cached for it so an unchanged list comes back as 304"""
+    cached = etags.get(url)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    return session.get(url, headers=headers, timeout=API_TIMEOUT)
+
+def request_webhook_list(
+    session: requests.Session, api_url: str, etags: Dict[str, Tuple[str, Dict[str, Any]]]
+) -> Tuple[str, bool, requests.Response]:
+    """Request one API's webhook list; returns the URL used, whether it holds summaries, and the response.
+    
+    Summaries carry just what the table and selector need; full records are
+    fetched one at a time when selected. APIs without the summary endpoint
+    get the full list as before.
+    """
+    url = f"{api_url}/webhooks/summary"
+    response = conditional_get(session, url, etags)
+    summaries = response.status_code != 404
+    if not summaries:
+        url = f"{api_url}/webhooks"
+        response = conditional_get(session, url, etags)
+    return url, summaries, response
+
 @st.cache_data(ttl=5)  # Cache for 5 seconds to allow real-time updates
 def fetch_webhook_data() -> Dict[str, Any]:
     """Fetch real webhook data from API, fall back to mock data"""
     
-    # Try production API first, then local
-    for api_url in [API_BASE_URL, LOCAL_API_URL]:
+    # Try the API that answered last time first, then the configured order
+    preference = get_api_preference()
+    last_good = preference["last_good"]
+    api_urls = [last_good] if last_good in API_URLS else []
+    api_urls += [url for url in API_URLS if url != last_good]
+    
+    # All APIs are asked at once, so a dead or slow one no longer delays
+    # the next; their answers are still taken in the order above. The
+    # executor isn't waited on, so a slower lower-priority request never
+    # holds up a result
+    session = get_http_session()
+    etags = get_etag_cache()
+    executor = ThreadPoolExecutor(max_workers=len(api_urls))
+    requests_in_flight = [
+        (api_url, executor.submit(request_webhook_list, session, api_url, etags))
+        for api_url in api_urls
+    ]
+    executor.shutdown(wait=False)
+    
+    for api_url, request in requests_in_flight:
         try:
-            response = requests.get(f"{api_url}/webhooks", timeout=5)
+            url, summaries, response = request.result()
+            if response.status_code == 304 and url in etags:
+                # Nothing changed since the last fetch - reuse its result
+                # (same fetch_id, so the per-webhook caches stay warm too)
+                preference["last_good"] = api_url
+                return etags[url][1]
             if response.status_code == 200:
-                data = response.json()
+                # orjson straight from the bytes - faster than response.json() on large lists
+                data = orjson.loads(response.content)
                 webhooks = data.get("webhooks", [])  # Extract webhooks array from response
                 if webhooks and len(webhooks) > 0:
-                    return {
+                    preference["last_good"] = api_url
+                    # Formatted (and tabulated) once per fetch rather than on every rerun
+                    formatted_webhooks = [format_webhook_for_display(w) for w in webhooks]
+                    result = {
+                        "fetch_id": time.time(),  # Identifies this fetch for per-webhook caches
                         "webhooks": webhooks,
+                        "formatted_webhooks": formatted_webhooks,
+                        "table": create_webhooks_table(formatted_webhooks),
+                        "labels": webhook_option_labels(formatted_webhooks),
+                        "summaries": summaries,
                         "source": "real_webhook",
                         "api_url": api_url,
                         "total_webhooks": len(webhooks)
                     }
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        etags[url] = (etag, result)
+                    return result
         except:
             continue
     
     # No real data available, use mock
+    formatted_mock = [formatted_mock_webhook()]
     return {
+        "fetch_id": 0,
         "webhooks": [MOCK_WEBHOOK_DATA],
+        "formatted_webhooks": formatted_mock,
+        "table": create_webhooks_table(formatted_mock),
+        "labels": webhook_option_labels(formatted_mock),
+        "summaries": False,
         "source": "demo_data", 
         "api_url": None,
         "total_webhooks": 1
     }
 
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def fetch_webhook_detail(api_url: str, fetch_id: float, index: int) -> Optional[Dict[str, Any]]:
+    """Fetch and format one full webhook by its position in the list, once per fetch.
+    
+    Returns None if the API no longer has it (e.g. cleared in the meantime).
+    """
+    try:
+        response = get_http_session().get(f"{api_url}/webhooks/{index}", timeout=API_TIMEOUT)
+        if response.status_code == 200:
+            return format_webhook_for_display(orjson.loads(response.content))
+    except (requests.RequestException, orjson.JSONDecodeError):
+        pass
+    return None
+
+# Display defaults for missing asset fields (values are all strings, so
+# shallow copies are independent)
+DEFAULT_ASSET_DETAILS = {
+    "name": "Unknown Asset",
+    "type_name": "Unknown",
+    "connector_name": "unknown",
+    "database_name": "",
+    "schema_name": "",
+    "qualified_name": "",
+    "url": "#"
+}
+
+# Form responses shown for data that isn't a webhook at all
+PARSE_ERROR_FORM_RESPONSES = {"Error": "Could not parse webhook data"}
+
 def format_webhook_for_display(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
     """Convert real webhook to display format"""
     
@@ -86,13 +230,7 @@ def format_webhook_for_display(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
             "requestor": payload.get("requestor", "Unknown"),
             "requestor_email": payload.get("requestor_email", "unknown@company.com"),
             "asset_details": {
-                "name": asset_details.get("name", "Unknown Asset"),
-                "type_name": asset_details.get("type_name", "Unknown"),
-                "connector_name": asset_details.get("connector_name", "unknown"),
-                "database_name": asset_details.get("database_name", ""),
-                "schema_name": asset_details.get("schema_name", ""),
-                "qualified_name": asset_details.get("qualified_name", ""),
-                "url": asset_details.get("url", "#")
+                field: asset_details.get(field, default) for field, default in DEFAULT_ASSET_DETAILS.items()
             },
             "form_responses": extract_form_responses(payload.get("forms", [])),
             "timestamp": payload.get("request_timestamp", webhook_data.get("timestamp", "")),
@@ -107,16 +245,15 @@ def format_webhook_for_display(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
             "source": webhook_data.get("source", "unknown"),
             "requestor": webhook_data.get("requestor", "Unknown"),
             "requestor_email": webhook_data.get("requestor_email", "unknown@company.com"),
-            "asset_details": webhook_data.get("asset_details", {
-                "name": "Unknown Asset",
-                "type_name": "Unknown",
-                "connector_name": "unknown",
-                "database_name": "",
-                "schema_name": "",
-                "qualified_name": "",
-                "url": "#"
-            }),
-            "form_responses": webhook_data.get("form_responses", extract_form_responses(webhook_data.get("forms", []))),
+            # Defaults are only built when the field is missing
+            "asset_details": (
+                webhook_data["asset_details"] if "asset_details" in webhook_data
+                else DEFAULT_ASSET_DETAILS.copy()
+            ),
+            "form_responses": (
+                webhook_data["form_responses"] if "form_responses" in webhook_data
+                else extract_form_responses(webhook_data.get("forms", []))
+            ),
             "timestamp": webhook_data.get("timestamp", ""),
             "approval_details": webhook_data.get("approval_details", {}),
             "raw_webhook": webhook_data
@@ -127,21 +264,22 @@ def format_webhook_for_display(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         "source": "unknown", 
         "requestor": "Unknown",
         "requestor_email": "unknown@company.com",
-        "asset_details": {
-            "name": "Data Error",
-            "type_name": "Unknown",
-            "connector_name": "unknown",
-            "database_name": "",
-            "schema_name": "",
-            "qualified_name": "",
-            "url": "#"
-        },
-        "form_responses": {"Error": "Could not parse webhook data"},
+        "asset_details": {**DEFAULT_ASSET_DETAILS, "name": "Data Error"},
+        "form_responses": PARSE_ERROR_FORM_RESPONSES.copy(),
         "timestamp": "",
         "approval_details": {},
         "raw_webhook": webhook_data
     }
 
+@st.cache_resource
+def formatted_mock_webhook() -> Dict[str, Any]:
+    """MOCK_WEBHOOK_DATA in display format, built once per server process.
+    
+    A resource cache (not a module constant) because Streamlit re-executes
+    the script on every rerun; the shared dict must not be mutated.
+    """
+    return format_webhook_for_display(MOCK_WEBHOOK_DATA)
+
 def extract_form_responses(forms: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Extract all form responses dynamically from Atlan form data"""
     if not forms:
@@ -149,6 +287,9 @@ def extract_form_responses(forms: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     all_responses = {}
     
+    # Only prefix field names with the form title when several forms could clash
+    multi = len(forms) > 1
+    
     for form in forms:
         form_title = form.get("form_title", "Unknown Form")
         response = form.get("response", {})
@@ -156,230 +297,223 @@ def extract_form_responses(forms: List[Dict[str, Any]]) -> Dict[str, Any]:
         if response:
             # Add form title as a prefix for clarity
             for key, value in response.items():
-                # Handle list values (like ["Red"])
-                if isinstance(value, list):
-                    display_value = ", ".join(str(v) for v in value)
+                # Most values are already strings; handle list values (like ["Red"])
+                if isinstance(value, str):
+                    display_value = value
+                elif isinstance(value, list):
+                    display_value = ", ".join(map(str, value))
                 else:
                     display_value = str(value)
                 
                 # Use form title + field name for unique keys
-                field_key = f"{form_title} - {key}" if len(forms) > 1 else key
+                field_key = f"{form_title} - {key}" if multi else key
                 all_responses[field_key] = display_value
         else:
             all_responses[f"{form_title}"] = "No response data"
     
     return all_responses if all_responses else {"No form responses": "No data available"}
 
+@lru_cache(maxsize=1024)
+def parse_iso_timestamp(value: str) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp (with optional trailing Z), or None if invalid.
+    
+    Memoized because the same timestamps recur across table rows and the
+    approval details; the trailing Z is swapped by slicing rather than a
+    full-string replace.
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
 def extract_approval_details(approval_details: Dict[str, Any]) -> str:
     """Extract all approval details dynamically from Atlan approval data"""
     if not approval_details:
         return "No approval details available"
     
-    approval_text = ""
+    parts: List[str] = []
     
     # Show auto-approval status
     is_auto_approved = approval_details.get('is_auto_approved', 'Unknown')
-    approval_text += f"Auto Approved: {is_auto_approved}\n"
+    parts.append(f"Auto Approved: {is_auto_approved}\n")
     
     # Show approvers with all their details
     approvers = approval_details.get('approvers', [])
     if approvers:
-        approval_text += f"\nApprovers ({len(approvers)}):\n"
+        parts.append(f"\nApprovers ({len(approvers)}):\n")
         for i, approver in enumerate(approvers, 1):
-            approval_text += f"  {i}. {approver.get('name', 'Unknown')}\n"
+            parts.append(f"  {i}. {approver.get('name', 'Unknown')}\n")
             
             # Show all available approver fields dynamically
             for key, value in approver.items():
                 if key != 'name':  # Already showed name above
                     # Format timestamps nicely
                     if 'at' in key.lower() and isinstance(value, str) and 'T' in value:
-                        try:
-                            from datetime import datetime
-                            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                            formatted_value = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-                        except:
-                            formatted_value = value
+                        dt = parse_iso_timestamp(value)
+                        formatted_value = dt.strftime("%Y-%m-%d %H:%M:%S UTC") if dt else value
                     else:
                         formatted_value = value
                     
                     # Format key names nicely
                     display_key = key.replace('_', ' ').title()
-                    approval_text += f"     {display_key}: {formatted_value}\n"
+                    parts.append(f"     {display_key}: {formatted_value}\n")
         
     else:
-        approval_text += "\nNo approvers found"
+        parts.append("\nNo approvers found")
     
     # Show any other top-level approval fields
     for key, value in approval_details.items():
         if key not in ['is_auto_approved', 'approvers']:
             display_key = key.replace('_', ' ').title()
-            approval_text += f"\n{display_key}: {value}"
+            parts.append(f"\n{display_key}: {value}")
     
-    return approval_text.strip()
+    # Joined once at the end rather than growing a string piece by piece
+    return "".join(parts).strip()
 
-def get_form_summary_for_table(forms: List[Dict[str, Any]]) -> str:
-    """Get a short summary of form responses for table display"""
+def get_form_summary_for_table(forms: List[Dict[str, Any]], responses: Optional[Dict[str, Any]] = None) -> str:
+    """Get a short summary of form responses for table display.
+    
+    Pass the already-extracted responses when available to skip
+    re-extracting them from the forms.
+    """
     if not forms:
         return "No form data"
     
-    responses = extract_form_responses(forms)
-    
-    # Get the first meaningful response for table summary
-    for key, value in responses.items():
-        if value and value != "No data available":
-            return f"{key}: {value}"[:50] + ("..." if len(f"{key}: {value}") > 50 else "")
-    
-    return "Form submitted"
+    if responses is None:
+        responses = extract_form_responses(forms)
+    
+    # Get the first meaningful response for table summary, stopping at the first hit
+    summary = next(
+        (f"{key}: {value}" for key, value in responses.items() if value and value != "No data available"),
+        None
+    )
+    if summary is None:
+        return "Form submitted"
+    return summary[:50] + "..." if len(summary) > 50 else summary
 
-def create_webhooks_table(webhooks: List[Dict[str, Any]]) -> pd.DataFrame:
-    """Create a pandas DataFrame for the webhooks table"""
-    
-    # Create table data
-    table_data = []
-    
-    for i, webhook in enumerate(webhooks):
-        formatted = format_webhook_for_display(webhook)
+def create_webhooks_table(formatted_webhooks: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Create a pandas DataFrame for the webhooks table from already-formatted webhooks"""
+    
+    # Build the table column by column - pandas takes the lists as-is instead
+    # of transposing one dict per row
+    n = len(formatted_webhooks)
+    timestamps = [""] * n
+    requestors = [""] * n
+    asset_names = [""] * n
+    asset_types = [""] * n
+    connectors = [""] * n
+    purposes = [""] * n
+    
+    for i, formatted in enumerate(formatted_webhooks):
+        webhook = formatted["raw_webhook"]
         
         # Extract time for display
         timestamp = formatted.get('timestamp', '')
         if timestamp:
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            dt = parse_iso_timestamp(timestamp) if isinstance(timestamp, str) else None
+            if dt:
                 time_display = dt.strftime("%Y-%m-%d %H:%M")
-            except:
+            else:
                 time_display = timestamp[:16] if len(timestamp) > 16 else timestamp
         else:
             time_display = "Unknown"
         
-        table_data.append({
-            "#": i + 1,
-            "Timestamp": time_display,
-            "Requestor": formatted.get('requestor', 'Unknown'),
-            "Asset Name": formatted['asset_details'].get('name', 'Unknown'),
-            "Asset Type": formatted['asset_details'].get('type_name', 'Unknown'),
-            "Connector": formatted['asset_details'].get('connector_name', 'unknown'),
-            "Purpose": get_form_summary_for_table(webhook.get("payload", {}).get("forms", []))
-        })
-    
-    return pd.DataFrame(table_data)
+        asset = formatted['asset_details']
+        timestamps[i] = time_display
+        requestors[i] = formatted.get('requestor', 'Unknown')
+        asset_names[i] = asset.get('name', 'Unknown')
+        asset_types[i] = asset.get('type_name', 'Unknown')
+        connectors[i] = asset.get('connector_name', 'unknown')
+        # Atlan webhooks were formatted from these same forms - reuse their responses
+        purposes[i] = get_form_summary_for_table(
+            webhook.get("payload", {}).get("forms", []),
+            formatted["form_responses"] if formatted.get("source") == "atlan_webhook" else None
+        )
+    
+    return pd.DataFrame({
+        "#": range(1, n + 1),
+        "Timestamp": timestamps,
+        "Requestor": requestors,
+        "Asset Name": asset_names,
+        "Asset Type": asset_types,
+        "Connector": connectors,
+        "Purpose": purposes
+    })
 
-def main():
-    st.title("📡 Atlan Webhook Data - NEW STORIES APP")
-    
-    # Fetch real webhook data
-    webhook_result = fetch_webhook_data()
-    all_webhooks = webhook_result["webhooks"]
-    data_source = webhook_result["source"]
-    api_url = webhook_result["api_url"]
-    total_webhooks = webhook_result["total_webhooks"]
-    
-    # Show data source status
-    if data_source == "real_webhook":
-        st.success(f"📡 **LIVE DATA** - Connected to API: {api_url}")
-        st.markdown(f"**{total_webhooks} total webhook(s) received**")
-        if st.button("🔄 Refresh Data"):
-            st.cache_data.clear()
-            st.rerun()
-    else:
-        st.warning("📋 **DEMO DATA** - No real webhooks received yet")
-        st.markdown("*Submit a data access request in Atlan to see real webhook data here*")
-    
-    st.markdown("**This is exactly what Atlan sends to your webhook endpoint**")
-    st.markdown("---")
-    
-    # Interactive webhook table
-    st.markdown("### 📋 Data Access Requests")
-    
-    if total_webhooks > 0 and all_webhooks:
-        # Create table
-        df = create_webhooks_table(all_webhooks)
-        
-        # Display the table
-        st.dataframe(df, use_container_width=True, hide_index=True)
-        
-        # Webhook selector (using the same pattern as the working dashboard)
-        webhook_options = []
-        for idx, webhook in enumerate(all_webhooks):
-            formatted = format_webhook_for_display(webhook)
-            # Create readable option string
-            option = f"#{idx + 1}: {formatted['asset_details'].get('name', 'Unknown')} - {formatted.get('requestor', 'Unknown')}"
-            webhook_options.append((option, idx, webhook))
-        
-        if webhook_options:
-            # Dropdown to select webhook
-            selected_option = st.selectbox(
-                "Select a webhook to view details:",
-                options=webhook_options,
-                format_func=lambda x: x[0],  # Display the readable string
-                help="Choose a specific webhook to see detailed information"
-            )
-            
-            if selected_option:
-                selected_webhook = selected_option[2]  # Get the actual webhook data
-                webhook_data = format_webhook_for_display(selected_webhook)
-            else:
-                # Default to first webhook if none selected
-                webhook_data = format_webhook_for_display(all_webhooks[0])
-        else:
-            # No webhooks available, use demo data
-            webhook_data = format_webhook_for_display(MOCK_WEBHOOK_DATA)
-    else:
-        # Fallback to demo data
-        webhook_data = format_webhook_for_display(MOCK_WEBHOOK_DATA)
-        st.markdown("*No webhook data available - showing demo data*")
-        st.markdown("---")
-    
-    # Main data presentation (existing detailed view)
-    st.markdown("### 🎯 Asset Information")
+def webhook_option_labels(formatted_webhooks: List[Dict[str, Any]]) -> List[str]:
+    """Selector label for every webhook, built once per fetch with the table."""
+    return [
+        f"#{idx + 1}: {formatted['asset_details'].get('name', 'Unknown')} - {formatted.get('requestor', 'Unknown')}"
+        for idx, formatted in enumerate(formatted_webhooks)
+    ]
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def webhook_json_text(fetch_id: float, index: int, _webhook: Dict[str, Any]) -> str:
+    """Serialize one webhook for the JSON panel, once per fetch.
+    
+    The (fetch_id, index) pair identifies the webhook, so the payload itself
+    is excluded from the cache key (leading underscore) and never hashed.
+    """
+    return orjson.dumps(_webhook, option=orjson.OPT_INDENT_2, default=str).decode()
+
+def markdown_cell(value: Any) -> str:
+    """Escape a value for a Markdown table cell"""
+    return str(value).replace("\\", "\\\\").replace("|", "\\|").replace("$", "\\$").replace("\n", " ")
+
+def markdown_table(rows: List[tuple]) -> str:
+    """Two-column Field/Value Markdown table"""
+    lines = ["| Field | Value |", "| --- | --- |"]
+    lines += [f"| {markdown_cell(field)} | {markdown_cell(value)} |" for field, value in rows]
+    return "\n".join(lines)
+
+def webhook_details_markdown(webhook_data: Dict[str, Any]) -> str:
+    """Asset, request, form and approval sections of the detail view as one Markdown document"""
     asset = webhook_data['asset_details']
-    
-    # Create organized sections
-    st.code(f"""
-Asset Name: {asset['name']}
-Asset Type: {asset['type_name']}
-Connector: {asset['connector_name']}
-Database: {asset.get('database_name', 'N/A')}
-Schema: {asset.get('schema_name', 'N/A')}
-Qualified Name: {asset.get('qualified_name', 'N/A')}
-URL: {asset.get('url', 'N/A')}
-    """)
-    
-    st.markdown("### 👤 Request Information")
-    st.code(f"""
-Requestor: {webhook_data['requestor']}
-Email: {webhook_data['requestor_email']}
-Timestamp: {webhook_data['timestamp']}
-    """)
-    
-    st.markdown("### 📝 Form Responses")
-    form = webhook_data['form_responses']
+    sections = [
+        "### 🎯 Asset Information",
+        markdown_table([
+            ("Asset Name", asset['name']),
+            ("Asset Type", asset['type_name']),
+            ("Connector", asset['connector_name']),
+            ("Database", asset.get('database_name', 'N/A')),
+            ("Schema", asset.get('schema_name', 'N/A')),
+            ("Qualified Name", asset.get('qualified_name', 'N/A')),
+            ("URL", asset.get('url', 'N/A')),
+        ]),
+        "### 👤 Request Information",
+        markdown_table([
+            ("Requestor", webhook_data['requestor']),
+            ("Email", webhook_data['requestor_email']),
+            ("Timestamp", webhook_data['timestamp']),
+        ]),
+        "### 📝 Form Responses",
+    ]
     
     # Dynamic form display - handle any form structure
+    form = webhook_data['form_responses']
     if form:
-        form_text = ""
-        for field_name, field_value in form.items():
-            form_text += f"{field_name}: {field_value}\n"
-        
-        if form_text.strip():
-            st.code(form_text.strip())
-        else:
-            st.code("No form data available")
+        sections.append(markdown_table(list(form.items())))
     else:
-        st.code("No form responses submitted")
+        sections.append("*No form responses submitted*")
     
-    # Show approval details if available
+    # Show approval details if available; kept preformatted since the
+    # approver list is indented text
     if "approval_details" in webhook_data and webhook_data["approval_details"]:
-        approval = webhook_data["approval_details"]
-        st.markdown("### ✅ Approval Details")
-        st.code(extract_approval_details(approval))
-    
-    st.markdown("### 📄 Complete JSON Payload")
-    if data_source == "real_webhook" and "raw_webhook" in webhook_data:
-        st.json(webhook_data["raw_webhook"])
-    else:
-        st.json(webhook_data)
+        sections.append("### ✅ Approval Details")
+        sections.append(f"```\n{extract_approval_details(webhook_data['approval_details'])}\n```")
     
-    # Fun interactive section - starts closed
+    return "\n\n".join(sections)
+
+@st.fragment
+def show_integration_playground(webhook_data: Dict[str, Any], total_webhooks: int):
+    """Interactive integration playground.
+    
+    A fragment, so its buttons and controls only rerun this section instead
+    of the whole page (fetch, table and detail view).
+    """
+    # Starts closed
     with st.expander("🎮 Interactive Integration Playground", expanded=False):
         st.markdown("**🚀 Art of the Possible - Interactive Demo**")
         
@@ -521,38 +655,166 @@ Timestamp: {webhook_data['timestamp']}
             • Notifications: {', '.join(notification_channels) if notification_channels else 'None'}
             • Duration: {access_duration} days
             """)
+
+@st.fragment
+def show_api_status(api_url: str, total_webhooks: int):
+    """API status and controls, rerun on its own like the playground.
     
-    # API Status section
-    if data_source == "real_webhook":
-        with st.expander("🔧 API Status & Controls", expanded=False):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("**📊 Connection Status**")
-                st.success(f"✅ Connected to: {api_url}")
-                st.info(f"📡 Total webhooks received: {total_webhooks}")
-                
-                if st.button("🧹 Clear All Webhook Data"):
-                    try:
-                        response = requests.delete(f"{api_url}/webhooks")
-                        if response.status_code == 200:
-                            st.success("🗑️ All webhook data cleared!")
-                            st.cache_data.clear()
-                            st.rerun()
-                        else:
-                            st.error("Failed to clear data")
-                    except:
-                        st.error("Could not connect to API")
+    Clearing the data still reruns the whole page via st.rerun().
+    """
+    with st.expander("🔧 API Status & Controls", expanded=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**📊 Connection Status**")
+            st.success(f"✅ Connected to: {api_url}")
+            st.info(f"📡 Total webhooks received: {total_webhooks}")
             
-            with col2:
-                st.markdown("**🔗 API Endpoints**")
-                st.code(f"""
+            if st.button("🧹 Clear All Webhook Data"):
+                try:
+                    response = get_http_session().delete(f"{api_url}/webhooks", timeout=5)
+                    if response.status_code == 200:
+                        st.success("🗑️ All webhook data cleared!")
+                        fetch_webhook_data.clear()
+                        st.rerun()
+                    else:
+                        st.error("Failed to clear data")
+                except:
+                    st.error("Could not connect to API")
+        
+        with col2:
+            st.markdown("**🔗 API Endpoints**")
+            st.code(f"""
 Webhook endpoint: {api_url}/webhook
 Get all data: {api_url}/webhooks  
 Latest webhook: {api_url}/webhooks/latest
 Configuration: {api_url}/config
 API docs: {api_url}/docs
-                """)
+            """)
+
+@st.fragment
+def show_webhook_details(webhook_result: Dict[str, Any], first_shown: Optional[int]):
+    """Webhook selector, detailed view and JSON payload.
+    
+    A fragment, so picking another webhook (or opening its JSON) reruns only
+    this section - not the status, table and controls above it. first_shown
+    is the first position listed in the table, or None with no real data
+    (the demo webhook is shown instead).
+    """
+    formatted_webhooks = webhook_result["formatted_webhooks"]
+    data_source = webhook_result["source"]
+    api_url = webhook_result["api_url"]
+    total_webhooks = webhook_result["total_webhooks"]
+    selected_index = None
+    
+    if first_shown is not None:
+        # Webhook selector - options are positions in the fetched list, with
+        # the readable labels built once per fetch (no per-rerun loop)
+        webhook_options = list(range(first_shown, len(formatted_webhooks)))
+        
+        # Dropdown to select webhook
+        selected_index = st.selectbox(
+            "Select a webhook to view details:",
+            options=webhook_options,
+            format_func=webhook_result["labels"].__getitem__,  # Display the readable string
+            help="Choose a specific webhook to see detailed information"
+        )
+        
+        # Default to first webhook if none selected; the fetch already
+        # holds every webhook formatted, so selection doesn't reformat it
+        if selected_index is None:
+            selected_index = webhook_options[0]
+        webhook_data = formatted_webhooks[selected_index]
+        if webhook_result["summaries"]:
+            # The list only holds summaries - fetch the full record,
+            # keeping the summary if it has gone away since
+            webhook_data = fetch_webhook_detail(
+                api_url, webhook_result["fetch_id"], selected_index
+            ) or webhook_data
+    else:
+        # No real webhooks - show the demo data
+        webhook_data = formatted_mock_webhook()
+    
+    # Main data presentation (existing detailed view)
+    # All detail sections in one Markdown element rather than a heading and
+    # a code block each
+    st.markdown(webhook_details_markdown(webhook_data))
+    
+    # An expander's body runs (and is sent) on every rerun even while
+    # collapsed, so the payload is only rendered once asked for. Collapsed
+    # beyond the top level; the pre-serialized string is passed straight
+    # through instead of re-dumping the payload on every rerun
+    with st.expander("📄 Complete JSON Payload", expanded=False):
+        if st.checkbox("Show JSON payload", key="show_json_payload"):
+            if data_source == "real_webhook" and "raw_webhook" in webhook_data:
+                st.json(
+                    webhook_json_text(webhook_result["fetch_id"], selected_index, webhook_data["raw_webhook"]),
+                    expanded=1
+                )
+            else:
+                st.json(webhook_data, expanded=1)
+    
+    # Fun interactive section - starts closed
+    show_integration_playground(webhook_data, total_webhooks)
+
+def main():
+    st.title("📡 Atlan Webhook Data - NEW STORIES APP")
+    
+    # Fetch real webhook data
+    webhook_result = fetch_webhook_data()
+    all_webhooks = webhook_result["webhooks"]
+    data_source = webhook_result["source"]
+    api_url = webhook_result["api_url"]
+    total_webhooks = webhook_result["total_webhooks"]
+    
+    # Show data source status
+    if data_source == "real_webhook":
+        st.success(f"📡 **LIVE DATA** - Connected to API: {api_url}")
+        st.markdown(f"**{total_webhooks} total webhook(s) received**")
+        if st.button("🔄 Refresh Data"):
+            # Only the fetch is evicted - the per-webhook caches are keyed by
+            # fetch_id, so the next fetch gets fresh entries without them
+            fetch_webhook_data.clear()
+            st.rerun()
+    else:
+        st.warning("📋 **DEMO DATA** - No real webhooks received yet")
+        st.markdown("*Submit a data access request in Atlan to see real webhook data here*")
+    
+    st.markdown("**This is exactly what Atlan sends to your webhook endpoint**")
+    st.markdown("---")
+    
+    # Interactive webhook table
+    st.markdown("### 📋 Data Access Requests")
+    
+    if total_webhooks > 0 and all_webhooks:
+        # Only the latest N webhooks are rendered - the whole table is sent
+        # to the browser on every rerun, so this keeps it bounded as the
+        # API accumulates webhooks
+        show_latest = st.selectbox("Show latest:", SHOW_LATEST_OPTIONS, index=1)
+        first_shown = max(0, total_webhooks - show_latest) if isinstance(show_latest, int) else 0
+        
+        # Table is built with the cached fetch, so unrelated widget
+        # interactions don't rebuild it
+        df = webhook_result["table"].iloc[first_shown:]
+        
+        # Display the table - small tables as a static table, which skips
+        # the interactive grid component; larger ones keep scrolling/sorting
+        if len(df) <= STATIC_TABLE_MAX_ROWS:
+            st.table(df.set_index("#"))
+        else:
+            st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        # Fallback to demo data
+        first_shown = None
+        st.markdown("*No webhook data available - showing demo data*")
+        st.markdown("---")
+    
+    # Selector and detailed view (a fragment of its own)
+    show_webhook_details(webhook_result, first_shown)
+    
+    # API Status section
+    if data_source == "real_webhook":
+        show_api_status(api_url, total_webhooks)
     
     st.markdown("---")
     st.markdown("**🎪 Demo Environment** • *Real-time webhook integration with Atlan*")
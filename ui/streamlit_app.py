@@ -25,12 +25,15 @@ Author: Generated for Atlan webhook demonstration platform
 
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import orjson
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 
 # ============================================================================
 # CONFIGURATION AND SETUP
@@ -49,39 +52,125 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # Show sidebar by default for filtering
 )
 
+# Seconds between automatic dashboard refreshes (when enabled)
+AUTO_REFRESH_SECONDS = 30
+
+# Most recent requests shown in the Data Table tab
+TABLE_MAX_ROWS = 200
+
+# Moment.js format for datetime columns in st.dataframe (matches format_timestamp)
+TABLE_DATETIME_FORMAT = "MMM DD, YYYY hh:mm A"
+
 # ============================================================================
 # UTILITY FUNCTIONS FOR DATA PROCESSING
 # ============================================================================
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Shared HTTP session for API calls.
+    
+    Cached as a resource (not data) because a Session is an unpicklable
+    connection pool: Streamlit re-executes this script on every rerun, and
+    a plain requests.get would open a new TCP/TLS connection to the API
+    each time the data cache expires. A couple of quick retries cover
+    dropped keep-alive connections.
+    
+    Returns:
+        requests.Session: Session with a pooled, retrying adapter
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.2, allowed_methods=["GET"])
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource
+def get_last_webhooks() -> Dict[str, Any]:
+    """
+    Last webhook list fetched from the API and its ETag.
+    
+    Shared across reruns and sessions so an expired data cache can ask the
+    API whether anything changed instead of downloading the list again.
+    
+    Returns:
+        Dict: {"etag": str or None, "webhooks": list, "fingerprint": str}
+    """
+    return {"etag": None, "webhooks": [], "fingerprint": ""}
+
 @st.cache_data(ttl=30)  # Cache data for 30 seconds to improve performance
-def fetch_webhook_data() -> List[Dict[Any, Any]]:
+def fetch_webhook_data() -> Tuple[List[Dict[Any, Any]], str]:
     """
     Fetch webhook data from the FastAPI backend.
     
     Uses Streamlit's caching mechanism to avoid repeated API calls
-    within a short time window, improving dashboard performance.
+    within a short time window, improving dashboard performance. Once the
+    cache expires the request is conditional (If-None-Match), so an
+    unchanged list costs a 304 with no body to download or parse.
+    
+    The list comes with a fingerprint: a short digest of the full response
+    body, used as the cache key of everything derived from the list. Any
+    change to any webhook changes it, and Streamlit only has to hash one
+    short string however many webhooks there are.
     
     Returns:
-        List[Dict]: List of webhook dictionaries, or empty list if API unavailable
+        Tuple[List[Dict], str]: List of webhook dictionaries and its fingerprint,
+            or an empty list and "" if API unavailable
     """
+    last = get_last_webhooks()
     try:
         # Make request to the FastAPI webhooks endpoint
-        response = requests.get(f"{API_BASE_URL}/webhooks", timeout=10)
+        headers = {"If-None-Match": last["etag"]} if last["etag"] else None
+        response = get_http_session().get(f"{API_BASE_URL}/webhooks", headers=headers, timeout=10)
         response.raise_for_status()  # Raise exception for HTTP errors
         
-        data = response.json()
-        return data.get("webhooks", [])
+        if response.status_code == 304:
+            # Unchanged since the last fetch
+            return last["webhooks"], last["fingerprint"]
+        
+        # orjson straight from the bytes - faster than response.json() on large lists
+        data = orjson.loads(response.content)
+        webhooks = data.get("webhooks", [])
+        fingerprint = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        last.update(etag=response.headers.get("ETag"), webhooks=webhooks, fingerprint=fingerprint)
+        return webhooks, fingerprint
     
     except requests.exceptions.RequestException as e:
         # Handle network errors gracefully
         st.error(f"⚠️ Unable to connect to API: {str(e)}")
         st.info("💡 The API service might be starting up (this takes ~30 seconds on Render free tier)")
-        return []
+        return [], ""
     
     except Exception as e:
         # Handle unexpected errors
         st.error(f"❌ Error fetching data: {str(e)}")
-        return []
+        return [], ""
+
+# Columns produced by parse_webhook_data, in the order each row's values are built
+PARSED_COLUMNS = (
+    # Asset information
+    'asset_name', 'asset_type', 'connector', 'database', 'schema', 'asset_url',
+    # Requestor information
+    'requestor', 'requestor_email', 'requestor_comment',
+    # Timing information
+    'request_timestamp', 'received_at',
+    # Approval workflow
+    'is_approved', 'approval_status', 'approver_names', 'is_auto_approved',
+    # Audit information
+    'signature_verified', 'verified_with_secret',
+    # Position of the original webhook in the fetched list (for the detailed view)
+    'webhook_id'
+)
+
+# Parsed columns converted to pandas categoricals (few distinct values)
+CATEGORICAL_COLUMNS = ('requestor', 'asset_type', 'connector')
+
+# Parsed flag columns stored as numpy bools (missing values become False)
+BOOLEAN_COLUMNS = ('is_approved', 'is_auto_approved', 'signature_verified')
 
 def parse_webhook_data(webhooks: List[Dict]) -> pd.DataFrame:
     """
@@ -89,6 +178,13 @@ def parse_webhook_data(webhooks: List[Dict]) -> pd.DataFrame:
     
     Extracts key fields from nested webhook structure and flattens them
     into columns suitable for filtering, charting, and table display.
+    The frame is built column by column (one list per column) rather than
+    from a list of row dicts, which pandas would have to transpose.
+    
+    Column dtypes: CATEGORICAL_COLUMNS are categoricals, BOOLEAN_COLUMNS
+    are numpy bools, received_datetime is a naive datetime64 and
+    request_datetime a UTC datetime64, webhook_id an integer; the rest hold
+    Python objects (strings, dates).
     
     Args:
         webhooks (List[Dict]): Raw webhook data from API
@@ -98,16 +194,12 @@ def parse_webhook_data(webhooks: List[Dict]) -> pd.DataFrame:
     """
     if not webhooks:
         # Return empty DataFrame with expected columns if no data
-        return pd.DataFrame(columns=[
-            'asset_name', 'requestor', 'requestor_email', 'asset_type', 
-            'connector', 'database', 'schema', 'request_timestamp', 
-            'is_approved', 'approval_status', 'approver_names', 
-            'requestor_comment', 'received_at'
-        ])
+        return pd.DataFrame(columns=[*PARSED_COLUMNS, 'received_datetime', 'received_date', 'request_datetime', 'inspector_label'])
     
-    processed_data = []
+    columns: Dict[str, list] = {name: [] for name in PARSED_COLUMNS}
+    column_lists = list(columns.values())
     
-    for webhook in webhooks:
+    for webhook_id, webhook in enumerate(webhooks):
         try:
             # Extract payload data (main webhook content)
             payload = webhook.get('payload', {})
@@ -120,54 +212,128 @@ def parse_webhook_data(webhooks: List[Dict]) -> pd.DataFrame:
             approval_status = "Approved" if is_approved else "Pending"
             approver_names = ", ".join([approver.get('name', 'Unknown') for approver in approvers])
             
-            # Create flattened record for DataFrame
-            record = {
+            # Flattened row, in PARSED_COLUMNS order
+            row = (
                 # Asset information
-                'asset_name': asset_details.get('name', 'Unknown'),
-                'asset_type': asset_details.get('type_name', 'Unknown'),
-                'connector': asset_details.get('connector_name', 'Unknown'),
-                'database': asset_details.get('database_name', 'Unknown'),
-                'schema': asset_details.get('schema_name', 'Unknown'),
-                'asset_url': asset_details.get('url', ''),
+                asset_details.get('name', 'Unknown'),
+                asset_details.get('type_name', 'Unknown'),
+                asset_details.get('connector_name', 'Unknown'),
+                asset_details.get('database_name', 'Unknown'),
+                asset_details.get('schema_name', 'Unknown'),
+                asset_details.get('url', ''),
                 
                 # Requestor information
-                'requestor': payload.get('requestor', 'Unknown'),
-                'requestor_email': payload.get('requestor_email', ''),
-                'requestor_comment': payload.get('requestor_comment', ''),
+                payload.get('requestor', 'Unknown'),
+                payload.get('requestor_email', ''),
+                payload.get('requestor_comment', ''),
                 
                 # Timing information
-                'request_timestamp': payload.get('request_timestamp', ''),
-                'received_at': webhook.get('received_at', ''),
+                payload.get('request_timestamp', ''),
+                webhook.get('received_at', ''),
                 
                 # Approval workflow
-                'is_approved': is_approved,
-                'approval_status': approval_status,
-                'approver_names': approver_names,
-                'is_auto_approved': approval_details.get('is_auto_approved', False),
+                is_approved,
+                approval_status,
+                approver_names,
+                approval_details.get('is_auto_approved', False),
                 
                 # Audit information
-                'signature_verified': webhook.get('signature_verified', False),
-                'verified_with_secret': webhook.get('verified_with_secret', ''),
+                webhook.get('signature_verified', False),
+                webhook.get('verified_with_secret', ''),
                 
-                # Store original webhook for detailed view
-                'raw_webhook': webhook
-            }
-            
-            processed_data.append(record)
+                # Original webhook is looked up by position for the
+                # detailed view instead of being stored in the frame
+                webhook_id
+            )
             
         except Exception as e:
             # Skip malformed webhook data but log the error
             st.warning(f"⚠️ Skipping malformed webhook data: {str(e)}")
             continue
+        
+        # Only complete rows are added, so the columns stay aligned
+        for column, value in zip(column_lists, row):
+            column.append(value)
+    
+    df = pd.DataFrame(columns)
+    
+    # Parse receive times once here for the filters, timeline and sorting.
+    # An explicit ISO8601 format takes pandas' vectorized parser, and
+    # cache=True reuses parses of repeated values
+    df['received_datetime'] = pd.to_datetime(df['received_at'], format='ISO8601', errors='coerce', cache=True)
+    df['received_date'] = df['received_datetime'].dt.date
+    # Atlan sends request times in UTC ("...Z"), so they parse to one tz-aware column
+    df['request_datetime'] = pd.to_datetime(df['request_timestamp'], format='ISO8601', errors='coerce', utc=True, cache=True)
+    
+    # Request inspector option labels, built here as whole-column string
+    # operations so widget reruns reuse them from the cached frame
+    df['inspector_label'] = (
+        df['asset_name'].astype(str) + " - " + df['requestor'].astype(str)
+        + " (" + df['received_at'].map(format_timestamp) + ")"
+    )
     
-    return pd.DataFrame(processed_data)
+    # Low-cardinality text columns used by the filters and charts are stored
+    # as categoricals: isin/value_counts then work on small integer codes
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    
+    # Flags from the JSON may be missing (None), which would leave an object
+    # column; plain bools keep the filter masks and sums on 1-byte arrays
+    for column in BOOLEAN_COLUMNS:
+        df[column] = df[column].to_numpy(dtype=bool)
+    return df
 
+@st.cache_data(ttl=30, max_entries=4, show_spinner=False)
+def parse_webhook_data_cached(fingerprint: str, _webhooks: List[Dict]) -> pd.DataFrame:
+    """
+    parse_webhook_data, reused across reruns while the webhook list is unchanged.
+    
+    Widget interactions rerun the whole script but only change the list
+    when the fetch cache expires, so the frame is keyed on a cheap
+    fingerprint of the list (see fetch_webhook_data) and the list
+    itself is excluded from hashing (leading underscore).
+    
+    Args:
+        fingerprint (str): Fingerprint of the list from fetch_webhook_data
+        _webhooks (List[Dict]): Raw webhook data from API
+        
+    Returns:
+        pd.DataFrame: Processed data with columns for analysis
+    """
+    return parse_webhook_data(_webhooks)
+
+@st.cache_data(ttl=30, max_entries=4, show_spinner=False)
+def get_filter_options(fingerprint: str, _df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Sidebar filter choices for a parsed frame, reused across reruns.
+    
+    The sorted unique values and the date bounds only change with the
+    data, so they are keyed on the same fingerprint as the parsed frame
+    instead of being recomputed on every widget interaction.
+    
+    Args:
+        fingerprint (str): Fingerprint of the list from fetch_webhook_data
+        _df (pd.DataFrame): Processed data (excluded from hashing)
+        
+    Returns:
+        Dict[str, Any]: Sorted options per filter column plus min/max dates
+    """
+    return {
+        # Categories are the column's distinct values, already sorted
+        **{column: _df[column].cat.categories.tolist() for column in CATEGORICAL_COLUMNS},
+        'min_date': _df['received_datetime'].min().date(),
+        'max_date': _df['received_datetime'].max().date(),
+    }
+
+@lru_cache(maxsize=4096)
 def format_timestamp(timestamp_str: str) -> str:
     """
     Format ISO timestamp string for display in the dashboard.
     
     Converts ISO format timestamps to human-readable format,
     handling timezone information and parsing errors gracefully.
+    Memoized because the table, request cards and detail view format
+    the same timestamps over and over within a run.
     
     Args:
         timestamp_str (str): ISO format timestamp string
@@ -182,7 +348,7 @@ def format_timestamp(timestamp_str: str) -> str:
         # Parse ISO format timestamp (with or without timezone)
         if timestamp_str.endswith('Z'):
             # UTC timezone indicator
-            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+            dt = datetime.fromisoformat(timestamp_str[:-1] + '+00:00')
         else:
             dt = datetime.fromisoformat(timestamp_str)
         
@@ -223,18 +389,52 @@ def render_header():
     
     # Add auto-refresh logic
     if auto_refresh:
-        # This causes the dashboard to refresh every 30 seconds
-        # Note: This is a simple implementation - production dashboards might
-        # use more sophisticated real-time update mechanisms
-        import time
-        time.sleep(30)
+        # Scheduled from the browser by a timed fragment, so the script
+        # finishes and the page stays interactive between refreshes
+        st.session_state["auto_refresh_due"] = False
+        auto_refresh_timer()
+
+@st.fragment(run_every=AUTO_REFRESH_SECONDS)
+def auto_refresh_timer():
+    """
+    Rerun the whole dashboard every AUTO_REFRESH_SECONDS without blocking.
+    
+    A fragment with run_every is re-executed on a browser-side timer. Its
+    first run, as part of a full page run, only arms it (render_header
+    disarms it on every full run); the next timed run then reruns the app.
+    """
+    if st.session_state.get("auto_refresh_due"):
         st.rerun()
+    st.session_state["auto_refresh_due"] = True
 
 # ============================================================================
 # KEY METRICS DISPLAY (Dashboard Overview Cards)
 # ============================================================================
 
-def render_metrics(df: pd.DataFrame):
+@st.cache_data(ttl=30, max_entries=16, show_spinner=False)
+def get_request_summary(frame_key: tuple, _df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Headline counts for a frame, shared by the metric cards and the table.
+    
+    Computed once per frame (keyed like the chart counts) instead of each
+    renderer re-scanning the columns on every rerun.
+    
+    Args:
+        frame_key (tuple): Key identifying the frame
+        _df (pd.DataFrame): Processed data (excluded from hashing)
+        
+    Returns:
+        Dict[str, Any]: total, approved and unique_requestors counts and
+            the latest received_at string
+    """
+    return {
+        'total': len(_df),
+        'approved': int(_df['is_approved'].sum()),
+        'unique_requestors': _df['requestor'].nunique(),
+        'latest_received_at': _df['received_at'].max() if len(_df) else '',
+    }
+
+def render_metrics(df: pd.DataFrame, frame_key: tuple):
     """
     Display key metrics in card format across the top of the dashboard.
     
@@ -243,6 +443,7 @@ def render_metrics(df: pd.DataFrame):
     
     Args:
         df (pd.DataFrame): Processed webhook data
+        frame_key (tuple): Key identifying the frame
     """
     if df.empty:
         # Show placeholder metrics when no data is available
@@ -250,10 +451,11 @@ def render_metrics(df: pd.DataFrame):
         return
     
     # Calculate key metrics
-    total_requests = len(df)
-    approved_requests = len(df[df['is_approved'] == True])
+    summary = get_request_summary(frame_key, df)
+    total_requests = summary['total']
+    approved_requests = summary['approved']
     pending_requests = total_requests - approved_requests
-    unique_requestors = df['requestor'].nunique()
+    unique_requestors = summary['unique_requestors']
     
     # Calculate approval rate as percentage
     approval_rate = (approved_requests / total_requests * 100) if total_requests > 0 else 0
@@ -298,7 +500,7 @@ def render_metrics(df: pd.DataFrame):
     with col5:
         # Latest request timing
         if not df.empty:
-            latest_time = df['received_at'].max()
+            latest_time = summary['latest_received_at']
             formatted_time = format_timestamp(latest_time)
             st.metric(
                 label="🕒 Latest Request", 
@@ -314,7 +516,7 @@ def render_metrics(df: pd.DataFrame):
 # FILTERING CONTROLS (Sidebar)
 # ============================================================================
 
-def render_filters(df: pd.DataFrame) -> pd.DataFrame:
+def render_filters(df: pd.DataFrame, fingerprint: str) -> Tuple[pd.DataFrame, tuple]:
     """
     Render filtering controls in the sidebar and apply filters to data.
     
@@ -323,102 +525,125 @@ def render_filters(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df (pd.DataFrame): Original processed data
+        fingerprint (str): Fingerprint the frame was cached under
         
     Returns:
-        pd.DataFrame: Filtered data based on user selections
+        Tuple[pd.DataFrame, tuple]: Filtered data based on user selections,
+            and a key identifying it (the fingerprint plus every selection)
     """
     if df.empty:
-        return df
+        return df, (fingerprint,)
+    
+    # Nothing to narrow down with a single request - skip building the widgets
+    if len(df) < 2:
+        st.sidebar.header("🔍 Filters")
+        st.sidebar.info("Filters become available once there are at least two requests")
+        return df, (fingerprint,)
+    
+    # Filter choices, computed once per data change
+    filter_options = get_filter_options(fingerprint, df)
     
     # Sidebar header
     st.sidebar.header("🔍 Filters")
     st.sidebar.markdown("Use these filters to drill down into your data")
     
-    # Requestor filter (multiselect)
-    requestors = st.sidebar.multiselect(
-        "👤 Requestor",
-        options=sorted(df['requestor'].unique()),
-        default=[],  # No default selection (show all)
-        help="Filter by specific requestors"
-    )
-    
-    # Asset type filter (multiselect)
-    asset_types = st.sidebar.multiselect(
-        "🗂️ Asset Type",
-        options=sorted(df['asset_type'].unique()),
-        default=[],  # No default selection (show all)
-        help="Filter by data asset types (Table, View, etc.)"
-    )
-    
-    # Connector filter (multiselect)
-    connectors = st.sidebar.multiselect(
-        "🔌 Connector",
-        options=sorted(df['connector'].unique()),
-        default=[],  # No default selection (show all)
-        help="Filter by data source connectors"
-    )
-    
-    # Approval status filter (radio buttons)
-    approval_filter = st.sidebar.radio(
-        "📊 Approval Status",
-        options=["All", "Approved Only", "Pending Only"],
-        index=0,  # Default to "All"
-        help="Filter by approval status"
-    )
-    
-    # Time range filter (date inputs)
-    st.sidebar.subheader("📅 Time Range")
-    col1, col2 = st.sidebar.columns(2)
-    
-    # Calculate date range from data
-    min_date = pd.to_datetime(df['received_at']).min().date() if not df.empty else datetime.now().date()
-    max_date = pd.to_datetime(df['received_at']).max().date() if not df.empty else datetime.now().date()
-    
-    with col1:
-        start_date = st.date_input(
-            "From",
-            value=min_date,
-            min_value=min_date,
-            max_value=max_date,
-            help="Start date for filtering"
+    # The controls sit in a form so a multi-part filter is applied in one
+    # rerun on submit, rather than one full rerun per widget change. Until
+    # the first submit the widgets return their defaults (no filtering)
+    with st.sidebar.form("filters"):
+        # Requestor filter (multiselect)
+        requestors = st.multiselect(
+            "👤 Requestor",
+            options=filter_options['requestor'],
+            default=[],  # No default selection (show all)
+            help="Filter by specific requestors"
         )
-    
-    with col2:
-        end_date = st.date_input(
-            "To",
-            value=max_date,
-            min_value=min_date,
-            max_value=max_date,
-            help="End date for filtering"
+        
+        # Asset type filter (multiselect)
+        asset_types = st.multiselect(
+            "🗂️ Asset Type",
+            options=filter_options['asset_type'],
+            default=[],  # No default selection (show all)
+            help="Filter by data asset types (Table, View, etc.)"
         )
+        
+        # Connector filter (multiselect)
+        connectors = st.multiselect(
+            "🔌 Connector",
+            options=filter_options['connector'],
+            default=[],  # No default selection (show all)
+            help="Filter by data source connectors"
+        )
+        
+        # Approval status filter (radio buttons)
+        approval_filter = st.radio(
+            "📊 Approval Status",
+            options=["All", "Approved Only", "Pending Only"],
+            index=0,  # Default to "All"
+            help="Filter by approval status"
+        )
+        
+        # Time range filter (date inputs)
+        st.subheader("📅 Time Range")
+        col1, col2 = st.columns(2)
+        
+        # Calculate date range from data
+        min_date = filter_options['min_date']
+        max_date = filter_options['max_date']
+        
+        with col1:
+            start_date = st.date_input(
+                "From",
+                value=min_date,
+                min_value=min_date,
+                max_value=max_date,
+                help="Start date for filtering"
+            )
+        
+        with col2:
+            end_date = st.date_input(
+                "To",
+                value=max_date,
+                min_value=min_date,
+                max_value=max_date,
+                help="End date for filtering"
+            )
+        
+        st.form_submit_button("✅ Apply Filters", use_container_width=True)
     
-    # Apply filters to DataFrame
-    filtered_df = df.copy()
+    # Apply filters to DataFrame. Each active filter narrows one combined
+    # boolean mask and the frame is indexed once at the end, instead of
+    # building an intermediate frame per filter. With no filter active the
+    # original frame is passed through untouched
+    mask = np.ones(len(df), dtype=bool)
     
     # Apply requestor filter
     if requestors:
-        filtered_df = filtered_df[filtered_df['requestor'].isin(requestors)]
+        mask &= df['requestor'].isin(requestors).to_numpy()
     
     # Apply asset type filter
     if asset_types:
-        filtered_df = filtered_df[filtered_df['asset_type'].isin(asset_types)]
+        mask &= df['asset_type'].isin(asset_types).to_numpy()
     
     # Apply connector filter
     if connectors:
-        filtered_df = filtered_df[filtered_df['connector'].isin(connectors)]
+        mask &= df['connector'].isin(connectors).to_numpy()
     
     # Apply approval status filter
     if approval_filter == "Approved Only":
-        filtered_df = filtered_df[filtered_df['is_approved'] == True]
+        mask &= df['is_approved'].to_numpy(dtype=bool)
     elif approval_filter == "Pending Only":
-        filtered_df = filtered_df[filtered_df['is_approved'] == False]
+        mask &= ~df['is_approved'].to_numpy(dtype=bool)
+    
+    # Apply date range filter (skipped when it spans all the data)
+    if start_date != min_date or end_date != max_date:
+        mask &= ((df['received_date'] >= start_date) & (df['received_date'] <= end_date)).to_numpy()
     
-    # Apply date range filter
-    filtered_df['received_date'] = pd.to_datetime(filtered_df['received_at']).dt.date
-    filtered_df = filtered_df[
-        (filtered_df['received_date'] >= start_date) & 
-        (filtered_df['received_date'] <= end_date)
-    ]
+    filtered_df = df if mask.all() else df[mask]
+    filter_key = (
+        fingerprint, tuple(requestors), tuple(asset_types), tuple(connectors),
+        approval_filter, start_date, end_date
+    )
     
     # Show filter results summary
     if len(filtered_df) != len(df):
@@ -430,13 +655,124 @@ def render_filters(df: pd.DataFrame) -> pd.DataFrame:
     if st.sidebar.button("🗑️ Clear All Filters"):
         st.rerun()  # Refresh to clear filters
     
-    return filtered_df
+    return filtered_df, filter_key
 
 # ============================================================================
 # DATA VISUALIZATION (Charts and Graphs)
 # ============================================================================
 
-def render_charts(df: pd.DataFrame):
+@st.cache_data(ttl=30, max_entries=16, show_spinner=False)
+def get_chart_figures(filter_key: tuple, _df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Build the dashboard's Plotly figures, reused across reruns with the same filters.
+    
+    Reruns triggered elsewhere (e.g. picking a request in the inspector)
+    leave the filtered frame unchanged, so the aggregates and the figures
+    built from them are keyed on the filter key from render_filters
+    instead of being recounted and rebuilt each time.
+    
+    Args:
+        filter_key (tuple): Key identifying the filtered frame
+        _df (pd.DataFrame): Filtered data (excluded from hashing)
+        
+    Returns:
+        Dict[str, Any]: 'asset_types', 'connectors' and 'timeline' figures
+            (None where there is nothing to plot)
+    """
+    # Imported on first use - plotly is slow to import, and a dashboard with
+    # no data yet (e.g. a cold start) never draws a chart
+    import plotly.express as px
+    
+    figures: Dict[str, Any] = {'asset_types': None, 'connectors': None}
+    
+    # Count asset types and connectors
+    # (categoricals also count categories filtered out of this frame)
+    asset_type_counts = _df['asset_type'].value_counts()
+    asset_type_counts = asset_type_counts[asset_type_counts > 0]
+    connector_counts = _df['connector'].value_counts()
+    connector_counts = connector_counts[connector_counts > 0]
+    
+    if not asset_type_counts.empty:
+        # Create pie chart with custom colors
+        fig_pie = px.pie(
+            values=asset_type_counts.values,
+            names=asset_type_counts.index,
+            title="Requests by Asset Type",
+            color_discrete_sequence=px.colors.qualitative.Set3  # Professional color palette
+        )
+        
+        # Customize pie chart appearance
+        fig_pie.update_traces(
+            textposition='inside',
+            textinfo='percent+label',
+            hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+        )
+        
+        # Update layout for better presentation
+        fig_pie.update_layout(
+            showlegend=True,
+            height=400,
+            font=dict(size=12),
+            title_font_size=14
+        )
+        figures['asset_types'] = fig_pie
+    
+    if not connector_counts.empty:
+        # Create horizontal bar chart
+        fig_bar = px.bar(
+            x=connector_counts.values,
+            y=connector_counts.index,
+            orientation='h',
+            title="Requests by Data Connector",
+            color=connector_counts.values,
+            color_continuous_scale='Blues'  # Professional blue gradient
+        )
+        
+        # Customize bar chart appearance
+        fig_bar.update_traces(
+            hovertemplate='<b>%{y}</b><br>Requests: %{x}<extra></extra>'
+        )
+        
+        # Update layout
+        fig_bar.update_layout(
+            xaxis_title="Number of Requests",
+            yaxis_title="Data Connector",
+            height=400,
+            font=dict(size=12),
+            title_font_size=14,
+            coloraxis_showscale=False  # Hide color scale
+        )
+        figures['connectors'] = fig_bar
+    
+    # Group by date for time series
+    daily_counts = _df.groupby('received_date').size().reset_index(name='requests')
+    
+    # Create time series line chart
+    fig_timeline = px.line(
+        daily_counts,
+        x='received_date',
+        y='requests',
+        title="Daily Request Volume",
+        markers=True  # Show markers on data points
+    )
+    
+    # Customize timeline chart
+    fig_timeline.update_traces(
+        hovertemplate='<b>%{x}</b><br>Requests: %{y}<extra></extra>',
+        line=dict(width=3, color='#1f77b4')  # Thicker line with professional color
+    )
+    
+    fig_timeline.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Number of Requests",
+        height=300,
+        font=dict(size=12),
+        title_font_size=14
+    )
+    figures['timeline'] = fig_timeline
+    return figures
+
+def render_charts(df: pd.DataFrame, filter_key: tuple):
     """
     Render interactive charts for data visualization.
     
@@ -445,11 +781,21 @@ def render_charts(df: pd.DataFrame):
     
     Args:
         df (pd.DataFrame): Filtered data to visualize
+        filter_key (tuple): Key identifying the filtered frame
     """
     if df.empty:
         st.info("📊 No data to visualize. Apply different filters or wait for new webhook data.")
         return
     
+    # A single request makes no meaningful distribution or timeline, so no
+    # figures are built for it (tight date filters often land here)
+    if len(df) < 2:
+        st.info("📊 Charts will appear when there are at least two requests to compare.")
+        return
+    
+    # Figures for all three charts (cached per filter selection)
+    figures = get_chart_figures(filter_key, df)
+    
     # Create two columns for side-by-side charts
     col1, col2 = st.columns(2)
     
@@ -457,34 +803,8 @@ def render_charts(df: pd.DataFrame):
         # Asset Type Distribution (Pie Chart)
         st.subheader("🗂️ Asset Type Distribution")
         
-        # Count asset types
-        asset_type_counts = df['asset_type'].value_counts()
-        
-        if not asset_type_counts.empty:
-            # Create pie chart with custom colors
-            fig_pie = px.pie(
-                values=asset_type_counts.values,
-                names=asset_type_counts.index,
-                title="Requests by Asset Type",
-                color_discrete_sequence=px.colors.qualitative.Set3  # Professional color palette
-            )
-            
-            # Customize pie chart appearance
-            fig_pie.update_traces(
-                textposition='inside',
-                textinfo='percent+label',
-                hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-            )
-            
-            # Update layout for better presentation
-            fig_pie.update_layout(
-                showlegend=True,
-                height=400,
-                font=dict(size=12),
-                title_font_size=14
-            )
-            
-            st.plotly_chart(fig_pie, use_container_width=True)
+        if figures['asset_types'] is not None:
+            st.plotly_chart(figures['asset_types'], use_container_width=True)
         else:
             st.info("No asset type data available for visualization")
     
@@ -492,79 +812,20 @@ def render_charts(df: pd.DataFrame):
         # Connector Analysis (Bar Chart)
         st.subheader("🔌 Connector Analysis")
         
-        # Count connectors
-        connector_counts = df['connector'].value_counts()
-        
-        if not connector_counts.empty:
-            # Create horizontal bar chart
-            fig_bar = px.bar(
-                x=connector_counts.values,
-                y=connector_counts.index,
-                orientation='h',
-                title="Requests by Data Connector",
-                color=connector_counts.values,
-                color_continuous_scale='Blues'  # Professional blue gradient
-            )
-            
-            # Customize bar chart appearance
-            fig_bar.update_traces(
-                hovertemplate='<b>%{y}</b><br>Requests: %{x}<extra></extra>'
-            )
-            
-            # Update layout
-            fig_bar.update_layout(
-                xaxis_title="Number of Requests",
-                yaxis_title="Data Connector",
-                height=400,
-                font=dict(size=12),
-                title_font_size=14,
-                coloraxis_showscale=False  # Hide color scale
-            )
-            
-            st.plotly_chart(fig_bar, use_container_width=True)
+        if figures['connectors'] is not None:
+            st.plotly_chart(figures['connectors'], use_container_width=True)
         else:
             st.info("No connector data available for visualization")
     
-    # Time Series Chart (if we have enough data)
+    # Time Series Chart
     st.subheader("📈 Request Timeline")
-    
-    if len(df) > 1:
-        # Group by date for time series
-        df['received_date'] = pd.to_datetime(df['received_at']).dt.date
-        daily_counts = df.groupby('received_date').size().reset_index(name='requests')
-        
-        # Create time series line chart
-        fig_timeline = px.line(
-            daily_counts,
-            x='received_date',
-            y='requests',
-            title="Daily Request Volume",
-            markers=True  # Show markers on data points
-        )
-        
-        # Customize timeline chart
-        fig_timeline.update_traces(
-            hovertemplate='<b>%{x}</b><br>Requests: %{y}<extra></extra>',
-            line=dict(width=3, color='#1f77b4')  # Thicker line with professional color
-        )
-        
-        fig_timeline.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Number of Requests",
-            height=300,
-            font=dict(size=12),
-            title_font_size=14
-        )
-        
-        st.plotly_chart(fig_timeline, use_container_width=True)
-    else:
-        st.info("📈 Time series visualization will appear when you have more data points")
+    st.plotly_chart(figures['timeline'], use_container_width=True)
 
 # ============================================================================
 # DATA TABLE DISPLAY (Recent Requests)
 # ============================================================================
 
-def render_data_table(df: pd.DataFrame):
+def render_data_table(df: pd.DataFrame, frame_key: tuple):
     """
     Display recent requests in a formatted table with status indicators.
     
@@ -573,6 +834,7 @@ def render_data_table(df: pd.DataFrame):
     
     Args:
         df (pd.DataFrame): Filtered data to display
+        frame_key (tuple): Key identifying the filtered frame
     """
     st.subheader("📋 Recent Requests")
     
@@ -580,25 +842,18 @@ def render_data_table(df: pd.DataFrame):
         st.info("📭 No requests to display. Create a data access request in Atlan to see it here!")
         return
     
-    # Prepare data for display table
-    display_df = df.copy()
-    
-    # Sort by received time (most recent first)
-    display_df['received_datetime'] = pd.to_datetime(display_df['received_at'])
-    display_df = display_df.sort_values('received_datetime', ascending=False)
+    # Prepare data for display table: only the most recent rows are sent
+    # to the browser, picked with a partial sort (most recent first)
+    display_df = df.nlargest(TABLE_MAX_ROWS, 'received_datetime')
     
-    # Format timestamps for display
-    display_df['Request Time'] = display_df['request_timestamp'].apply(format_timestamp)
-    display_df['Received Time'] = display_df['received_at'].apply(format_timestamp)
+    # Timestamps are passed as the parsed datetime columns and formatted by
+    # the table in the browser (see column_config), not per row in Python
+    display_df['Request Time'] = display_df['request_datetime']
+    display_df['Received Time'] = display_df['received_datetime']
     
     # Create status indicator column with emojis
-    def get_status_indicator(row):
-        if row['is_approved']:
-            return "✅ Approved"
-        else:
-            return "⏳ Pending"
-    
-    display_df['Status'] = display_df.apply(get_status_indicator, axis=1)
+    # (one vectorized choice over the column instead of a Python call per row)
+    display_df['Status'] = np.where(display_df['is_approved'].to_numpy(dtype=bool), "✅ Approved", "⏳ Pending")
     
     # Select and rename columns for display
     display_columns = {
@@ -631,16 +886,28 @@ def render_data_table(df: pd.DataFrame):
             "Requestor": st.column_config.TextColumn(
                 "Requestor",
                 help="Person who made the data access request"
+            ),
+            # Same display format as format_timestamp ("Dec 30, 2024 03:42 PM")
+            "Requested": st.column_config.DatetimeColumn(
+                "Requested",
+                format=TABLE_DATETIME_FORMAT
+            ),
+            "Received": st.column_config.DatetimeColumn(
+                "Received",
+                format=TABLE_DATETIME_FORMAT
             )
         }
     )
     
+    if len(df) > TABLE_MAX_ROWS:
+        st.caption(f"Showing the {TABLE_MAX_ROWS} most recent of {len(df)} requests")
+    
     # Add summary information below the table
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Showing", len(table_df), "requests")
     with col2:
-        approved_count = len(df[df['is_approved'] == True])
+        approved_count = get_request_summary(frame_key, df)['approved']
         st.metric("Approved", approved_count, f"of {len(df)}")
     with col3:
         if len(df) > 0:
@@ -651,15 +918,19 @@ def render_data_table(df: pd.DataFrame):
 # DETAILED REQUEST INSPECTOR
 # ============================================================================
 
-def render_request_inspector(df: pd.DataFrame):
+@st.fragment
+def render_request_inspector(df: pd.DataFrame, webhooks: List[Dict]):
     """
     Provide detailed inspection of individual webhook requests.
     
     Allows users to drill down into specific requests to see all
     available metadata and the raw webhook JSON.
+    Runs as a fragment: picking a request (or downloading it) reruns only
+    the inspector, not the filters, charts and table around it.
     
     Args:
         df (pd.DataFrame): Filtered data containing requests to inspect
+        webhooks (List[Dict]): Raw webhook data the frame was parsed from
     """
     st.subheader("🔍 Request Inspector")
     
@@ -667,25 +938,21 @@ def render_request_inspector(df: pd.DataFrame):
         st.info("📭 No requests available for inspection")
         return
     
-    # Request selector
-    request_options = []
-    for idx, row in df.iterrows():
-        # Create readable option string
-        request_time = format_timestamp(row['received_at'])
-        option = f"{row['asset_name']} - {row['requestor']} ({request_time})"
-        request_options.append((option, idx))
+    # Request selector - the options are the row indices themselves, with
+    # their labels (precomputed by parse_webhook_data) looked up only for
+    # display, so no (label, index) tuple is built or compared per row
+    request_labels = dict(zip(df.index.tolist(), df['inspector_label'].tolist()))
     
-    if request_options:
+    if request_labels:
         # Dropdown to select request
-        selected_option = st.selectbox(
+        selected_idx = st.selectbox(
             "Select a request to inspect:",
-            options=request_options,
-            format_func=lambda x: x[0],  # Display the readable string
+            options=list(request_labels),
+            format_func=request_labels.__getitem__,  # Display the readable string
             help="Choose a specific request to see detailed information"
         )
         
-        if selected_option:
-            selected_idx = selected_option[1]
+        if selected_idx is not None:
             selected_request = df.loc[selected_idx]
             
             # Display detailed information in expandable sections
@@ -694,25 +961,32 @@ def render_request_inspector(df: pd.DataFrame):
             with st.expander("📋 Basic Information", expanded=True):
                 col1, col2 = st.columns(2)
                 
+                # Each column is one Markdown element (paragraphs joined up
+                # front) rather than a separate element per line
                 with col1:
-                    st.write("**Asset Details:**")
-                    st.write(f"• Name: {selected_request['asset_name']}")
-                    st.write(f"• Type: {selected_request['asset_type']}")
-                    st.write(f"• Connector: {selected_request['connector']}")
-                    st.write(f"• Database: {selected_request['database']}")
-                    st.write(f"• Schema: {selected_request['schema']}")
+                    asset_lines = [
+                        "**Asset Details:**",
+                        f"• Name: {selected_request['asset_name']}",
+                        f"• Type: {selected_request['asset_type']}",
+                        f"• Connector: {selected_request['connector']}",
+                        f"• Database: {selected_request['database']}",
+                        f"• Schema: {selected_request['schema']}",
+                    ]
                     
                     # Asset URL link if available
                     if selected_request.get('asset_url'):
-                        st.markdown(f"• [🔗 View in Atlan]({selected_request['asset_url']})")
+                        asset_lines.append(f"• [🔗 View in Atlan]({selected_request['asset_url']})")
+                    st.markdown("\n\n".join(asset_lines))
                 
                 with col2:
-                    st.write("**Request Details:**")
-                    st.write(f"• Requestor: {selected_request['requestor']}")
-                    st.write(f"• Email: {selected_request['requestor_email']}")
-                    st.write(f"• Status: {'✅ Approved' if selected_request['is_approved'] else '⏳ Pending'}")
-                    st.write(f"• Requested: {format_timestamp(selected_request['request_timestamp'])}")
-                    st.write(f"• Received: {format_timestamp(selected_request['received_at'])}")
+                    st.markdown("\n\n".join([
+                        "**Request Details:**",
+                        f"• Requestor: {selected_request['requestor']}",
+                        f"• Email: {selected_request['requestor_email']}",
+                        f"• Status: {'✅ Approved' if selected_request['is_approved'] else '⏳ Pending'}",
+                        f"• Requested: {format_timestamp(selected_request['request_timestamp'])}",
+                        f"• Received: {format_timestamp(selected_request['received_at'])}",
+                    ]))
             
             # Approval Information
             with st.expander("✅ Approval Details"):
@@ -751,19 +1025,23 @@ def render_request_inspector(df: pd.DataFrame):
             with st.expander("🗄️ Raw Webhook Data"):
                 st.write("**Complete webhook payload as received from Atlan:**")
                 
-                # Pretty print the JSON with syntax highlighting
-                raw_webhook = selected_request.get('raw_webhook', {})
-                st.json(raw_webhook)
-                
-                # Option to download raw data
-                json_str = json.dumps(raw_webhook, indent=2)
-                st.download_button(
-                    label="📥 Download JSON",
-                    data=json_str,
-                    file_name=f"webhook_{selected_request['asset_name']}_{selected_request['received_at'][:10]}.json",
-                    mime="application/json",
-                    help="Download the complete webhook data as JSON file"
-                )
+                # An expander's body runs on every rerun even while collapsed,
+                # so the payload is only serialized and sent once asked for
+                if st.checkbox("Show raw JSON", key=f"show_raw_{selected_idx}"):
+                    # Pretty print the JSON with syntax highlighting
+                    # (serialized once with orjson, for both the viewer and the download)
+                    raw_webhook = webhooks[selected_request['webhook_id']]
+                    json_str = orjson.dumps(raw_webhook, option=orjson.OPT_INDENT_2).decode()
+                    st.json(json_str)
+                    
+                    # Option to download raw data
+                    st.download_button(
+                        label="📥 Download JSON",
+                        data=json_str,
+                        file_name=f"webhook_{selected_request['asset_name']}_{selected_request['received_at'][:10]}.json",
+                        mime="application/json",
+                        help="Download the complete webhook data as JSON file"
+                    )
 
 # ============================================================================
 # MAIN DASHBOARD APPLICATION
@@ -787,34 +1065,34 @@ def main():
     
     # Fetch webhook data from API
     with st.spinner("🔄 Loading webhook data..."):
-        webhook_data = fetch_webhook_data()
+        webhook_data, fingerprint = fetch_webhook_data()
     
     # Process raw webhook data into DataFrame
-    df = parse_webhook_data(webhook_data)
+    df = parse_webhook_data_cached(fingerprint, webhook_data)
     
     # Display key metrics at the top
-    render_metrics(df)
+    render_metrics(df, (fingerprint,))
     
     # Apply filters and get filtered data
     if not df.empty:
-        filtered_df = render_filters(df)
+        filtered_df, filter_key = render_filters(df, fingerprint)
     else:
-        filtered_df = df
+        filtered_df, filter_key = df, (fingerprint,)
     
     # Main content area with tabs for different views
     tab1, tab2, tab3 = st.tabs(["📊 Analytics", "📋 Data Table", "🔍 Inspector"])
     
     with tab1:
         # Analytics tab with charts and visualizations
-        render_charts(filtered_df)
+        render_charts(filtered_df, filter_key)
     
     with tab2:
         # Data table tab with recent requests
-        render_data_table(filtered_df)
+        render_data_table(filtered_df, filter_key)
     
     with tab3:
         # Request inspector tab for detailed analysis
-        render_request_inspector(filtered_df)
+        render_request_inspector(filtered_df, webhook_data)
     
     # Footer with system information
     with st.expander("ℹ️ System Information"):